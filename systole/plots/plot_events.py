@@ -7,10 +7,34 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 from matplotlib.axes import Axes
+from numba import jit, prange
 
 from systole.plots.utils import get_plotting_function
 
 
+@jit(nopython=True, parallel=True, cache=True)
+def _expand_triggers(
+    idx: np.ndarray, sfreq: float, tmin: float, tmax: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Epochs timing (tmin, trigger, tmax, in seconds) for one condition.
+
+    The per-trigger arithmetic is embarrassingly parallel and distributed
+    over the available cores, which pays off when long recordings provide
+    very large trigger arrays.
+    """
+    n = idx.shape[0]
+    out_tmin = np.empty(n, dtype=np.float64)
+    out_trigger = np.empty(n, dtype=np.float64)
+    out_tmax = np.empty(n, dtype=np.float64)
+    for k in prange(n):
+        t = idx[k] / sfreq
+        out_tmin[k] = t + tmin
+        out_trigger[k] = t
+        out_tmax[k] = t + tmax
+
+    return out_tmin, out_trigger, out_tmax
+
+
 def plot_events(
     triggers: Optional[Union[List, np.ndarray]] = None,
     triggers_idx: Optional[Union[List, np.ndarray]] = None,
@@ -31,7 +55,7 @@ def plot_events(
     triggers : list | np.ndarray
         The events triggers. `0` indicates no events, `1` indicates the triger
         for one event. Different conditions should be provided separately as list
-        of arrays.
+        of arrays, or as a dense 2d array of shape `(n_conditions, n_samples)`.
     triggers_idx : list | np.ndarray
         Trigger indexes. Each value encode the sample where an event occured (see
         also `sfreq`). Different conditions should be provided separately as list of
@@ -149,13 +173,20 @@ def plot_events(
     if (triggers_idx is None) & (triggers is None):
         raise ValueError("No triggers provided")
     elif triggers_idx is None:
-        if isinstance(triggers, np.ndarray):
-            triggers = [triggers]
-
-        # Transform the boolean vector into triggers indexes
-        triggers_idx = []
-        for this_triggers in triggers:  # type: ignore
-            triggers_idx.append(np.where(this_triggers)[0])
+        if isinstance(triggers, np.ndarray) and triggers.ndim == 2:
+            # Dense (n_conditions, n_samples) array provided: expand all the
+            # conditions with a single np.nonzero call
+            rows, cols = np.nonzero(triggers)
+            triggers_idx = [cols[rows == i] for i in range(triggers.shape[0])]
+        else:
+            if isinstance(triggers, np.ndarray):
+                triggers = [triggers]
+
+            # Transform each boolean vector into triggers indexes
+            triggers_idx = [
+                np.flatnonzero(this_triggers)
+                for this_triggers in triggers  # type: ignore
+            ]
 
     elif triggers is None:
         if isinstance(triggers_idx, np.ndarray):
@@ -192,38 +223,49 @@ def plot_events(
 
     # Creating the events info df
     # DataFrame : (tmin, trigger, tmax, label, color, df)
-    df = pd.DataFrame([])
+    # Each condition is vectorized into one small data frame and the frames
+    # are concatenated once after the loop
+    frames = []
+
+    # Resolve the condition labels once as an integer-indexed list, instead
+    # of building a throwaway str key for each dict lookup inside the loop
+    label_list = [labels[str(i + 1)] for i in range(len(triggers_idx))]
 
     # Loop across conditions
     for i, this_trigger_idx in enumerate(triggers_idx):
 
-        # Event color
+        # Event color and label, constant across the condition
         col = next(this_palette)
-
-        # Loop across triggers
-        for event in this_trigger_idx:
-            this_tmin = (event / sfreq) + tmin
-            this_trigger = event / sfreq
-            this_tmax = (event / sfreq) + tmax
-            df = pd.concat(
-                [
-                    df,
-                    pd.DataFrame(
-                        {
-                            "tmin": this_tmin,
-                            "trigger": this_trigger,
-                            "tmax": this_tmax,
-                            "label": labels[str(i + 1)],
-                            "color": [col],
-                        }
-                    ),
-                ],
-                ignore_index=True,
+        label = label_list[i]
+
+        # Vectorized timing of all the triggers of this condition
+        this_tmin, this_trigger, this_tmax = _expand_triggers(
+            np.asarray(this_trigger_idx, dtype=np.float64),
+            float(sfreq),
+            tmin,
+            tmax,
+        )
+        frames.append(
+            pd.DataFrame(
+                {
+                    "tmin": this_tmin,
+                    "trigger": this_trigger,
+                    "tmax": this_tmax,
+                    "label": label,
+                    "color": [col] * len(this_trigger),
+                }
             )
+        )
+
+    if frames:
+        df = pd.concat(frames, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=["tmin", "trigger", "tmax", "label", "color"])
 
-    df["tmin"] = pd.to_datetime(df["tmin"], unit="s", origin="unix")
-    df["trigger"] = pd.to_datetime(df["trigger"], unit="s", origin="unix")
-    df["tmax"] = pd.to_datetime(df["tmax"], unit="s", origin="unix")
+    # Convert the three timing columns to datetime in a single vectorized
+    # cast (seconds -> nanoseconds since unix epoch)
+    timings = df[["tmin", "trigger", "tmax"]].to_numpy(dtype="float64")
+    df[["tmin", "trigger", "tmax"]] = (timings * 1e9).astype("datetime64[ns]")
 
     plot_raw_args = {"df": df, "figsize": figsize, "ax": ax, "behavior": behavior}
 
@@ -3,15 +3,209 @@
 import socket
 import time
 from struct import unpack
-from typing import Dict, List, Optional
+from typing import List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+from numba import jit
 
 from systole.detection import ppg_peaks
 from systole.plots import plot_events, plot_raw
 
 
+@jit(
+    "Tuple((int64, float64, float64))(float32[::1], float32[::1], float32[::1], "
+    "float32[::1], uint8[::1], int64, float64, int64, int64, int64, int64, "
+    "float64, float64)",
+    nopython=True,
+    cache=True,
+    nogil=True,
+    fastmath=True,
+)
+def _update_oximeter(
+    recording: np.ndarray,
+    times: np.ndarray,
+    threshold: np.ndarray,
+    diff: np.ndarray,
+    peaks: np.ndarray,
+    n: int,
+    value: float,
+    sfreq: int,
+    window: int,
+    dist: int,
+    last_peak_idx: int,
+    s: float,
+    sq: float,
+) -> Tuple[int, float, float]:
+    """Per-sample update of the Oximeter recording buffers.
+
+    Write the new sample at index `n`, update the rolling detection threshold
+    (mean + standard deviation over the last `window` samples), the signal
+    differential and the peaks detection state machine.
+
+    Parameters
+    ----------
+    recording, times, threshold, diff, peaks : np.ndarray
+        The preallocated recording buffers.
+    n : int
+        Index of the new sample.
+    value : float
+        The pulse waveform value of the new sample.
+    sfreq : int
+        The sampling frequency.
+    window : int
+        Length of the threshold window (samples).
+    dist : int
+        Refractory period between two peaks (samples).
+    last_peak_idx : int
+        Index of the last detected peak (`-1` if no peak was detected yet).
+    s, sq : float
+        Running sum and sum of squares over the last `window` samples.
+
+    Returns
+    -------
+    is_peak : int
+        `1` if a peak was labelled at sample `n`, `0` otherwise.
+    s, sq : float
+        The updated running sums, including sample `n`.
+    """
+    # Store new data
+    recording[n] = value
+    peaks[n] = 0
+    times[n] = n / sfreq
+
+    # Update threshold (rolling mean + standard deviation) from the running
+    # sums: add the incoming sample, subtract the one leaving the window
+    s += recording[n]
+    sq += recording[n] * recording[n]
+    if n >= window:
+        old = recording[n - window]
+        s -= old
+        sq -= old * old
+    w = window if n + 1 > window else n + 1
+    m = s / w
+    var = sq / w - m * m
+    if var < 0.0:
+        var = 0.0
+    threshold[n] = m + np.sqrt(var)
+
+    # Store new differential and run the peaks detection state machine
+    is_peak = 0
+    if n == 0:
+        diff[n] = 0.0
+    else:
+        diff[n] = recording[n] - recording[n - 1]
+
+        # Is it a threshold crossing value?
+        if value > threshold[n]:
+
+            # Is the new differential zero or crossing zero?
+            if (diff[n] <= 0) & (diff[n - 1] > 0):
+
+                # Is it far enough from the previous peak (0.2 s)?
+                if (last_peak_idx < 0) | (n - last_peak_idx >= dist):
+                    peaks[n] = 1
+                    is_peak = 1
+
+    return is_peak, s, sq
+
+
+@jit(nopython=True, cache=True, nogil=True)
+def _rr_from_peaks(peaks: np.ndarray, sfreq: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Fused computation of RR intervals and BPM from a boolean peaks vector.
+
+    Walk the peaks vector once, emitting the RR interval (milliseconds) and
+    the corresponding beats per minute for each pair of successive peaks,
+    without materializing the intermediate peak indexes array.
+
+    Parameters
+    ----------
+    peaks : np.ndarray
+        Boolean array of peaks detection.
+    sfreq : float
+        The sampling frequency.
+
+    Returns
+    -------
+    rr : np.ndarray
+        RR intervals (milliseconds).
+    bpm : np.ndarray
+        Beats per minute.
+    """
+    n_peaks = 0
+    for i in range(peaks.shape[0]):
+        if peaks[i]:
+            n_peaks += 1
+    n_rr = n_peaks - 1 if n_peaks > 0 else 0
+    rr = np.empty(n_rr, dtype=np.float64)
+    bpm = np.empty(n_rr, dtype=np.float64)
+    last, k = -1, 0
+    for i in range(peaks.shape[0]):
+        if peaks[i]:
+            if last >= 0:
+                rr[k] = (i - last) / sfreq * 1000
+                bpm[k] = 60000 / rr[k]
+                k += 1
+            last = i
+
+    return rr, bpm
+
+
+class _ChannelBuffer:
+    """Dict-like access to the preallocated additional channels array.
+
+    The channels are stored as a single `(n_channels, capacity)` float32
+    array aligned with the recording buffers, so that incrementing the
+    recording does not require any per-sample work on the channels. Items
+    are accessed with the usual `Channel_{i}` keys and returned as zero-copy
+    views on the recorded samples.
+
+    Parameters
+    ----------
+    oximeter : Oximeter
+        The parent recording instance, providing the sample cursor.
+    n_channels : int
+        Number of additional channels.
+    """
+
+    def __init__(self, oximeter: "Oximeter", n_channels: int):
+        self._oximeter = oximeter
+        self._data = np.zeros((n_channels, oximeter._capacity), dtype=np.float32)
+
+    def _index(self, key) -> int:
+        if isinstance(key, str):
+            if key not in self.keys():
+                raise KeyError(key)
+            return int(key.split("_")[-1])
+        return int(key)
+
+    def _grow(self, capacity: int):
+        """Grow the channels array to the provided capacity."""
+        new = np.zeros((self._data.shape[0], capacity), dtype=self._data.dtype)
+        new[:, : self._data.shape[1]] = self._data
+        self._data = new
+
+    def keys(self) -> List[str]:
+        return [f"Channel_{i}" for i in range(self._data.shape[0])]
+
+    def __getitem__(self, key) -> np.ndarray:
+        return self._data[self._index(key), : self._oximeter.n]
+
+    def __setitem__(self, key, value):
+        row = self._data[self._index(key)]
+        value = np.asarray(value, dtype=row.dtype)
+        if value.size == self._oximeter.n:
+            row[: self._oximeter.n] = value
+        else:
+            row[: self._oximeter.n] = 0
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+
 class Oximeter:
     """Recording PPG signal with Nonin pulse oximeter.
 
@@ -32,31 +226,31 @@ class Oximeter:
 
     Attributes
     ----------
-    instant_rr : list
+    instant_rr : np.ndarray
         Time serie of instantaneous heartrate.
     n_channels : int | None
         Number of additional channels.
-    recording : list
+    recording : np.ndarray
         Time serie of PPG signal.
     sfreq : int
         Sampling frequnecy. Default value is 75 Hz.
-    threshold : list
+    threshold : np.ndarray
         The threshold used to detect beat peaks. Will use the average +
         standars deviation.
-    times : list
+    times : np.ndarray
         Time vector (in seconds).
-    diff : list
+    diff : np.ndarray
         Records the differential of the PPG signal. Used to detect heartbeat
         peaks.
-    peaks : list
-        List of 0 and 1. 1 index detected peaks.
-    channels : list | dict
+    peaks : np.ndarray
+        Array of 0 and 1. 1 index detected peaks.
+    channels : _ChannelBuffer | None
         Additional channels to record. Will continuously record *n_channels*
         additional channels in parallel of `recording` with default `0` as
-        defalut value.
+        defalut value. Accessed like a dict using `Channel_{i}` keys.
     serial : PySerial instance
         PySerial object indexing the USB port to read.
-    rr : list or None
+    rr : np.ndarray or None
         RR intervals time course. The time course will be generated if
         :py:func:`self.find_peaks` is used.
 
@@ -108,16 +302,20 @@ class Oximeter:
 
     >>> oximeter.plot()
 
-    .. warning:: Data read from the serial port are appended to list and
-      processed for pulse detection and instantaneous heart rate estimation.
-      The time required to append new data to the recording will increase as
-      its size increase. You should beware that this processing time does not
-      exceed the sampling frequency (i.e. 75Hz or 0.013 seconds per sample for
-      Nonin pulse oximeters) to allow continuous recording and fast processing
-      of in waiting samples. We recommend storing regularly 5 minutes recording
-      as .npy file using the :py:func:save() function.
+    .. warning:: Data read from the serial port are stored in preallocated
+      NumPy buffers and processed for pulse detection and instantaneous heart
+      rate estimation. Adding a new sample is a constant-time operation, the
+      buffers being doubled in size when the capacity is exhausted. The
+      `recording`, `peaks`, `times`, `threshold`, `diff` and `instant_rr`
+      attributes are zero-copy views on these buffers. We recommend storing
+      regularly 5 minutes recording as .npy file using the :py:func:save()
+      function.
     """
 
+    sfreq: int
+    n_channels: Optional[int]
+    channels: Optional[_ChannelBuffer]
+
     def __init__(
         self,
         serial,
@@ -157,23 +355,55 @@ class Oximeter:
         """
         self.serial = serial
         self.lag = 0
+
+        # Reuse the preallocated buffers if the recording parameters are
+        # unchanged: re-synchronizing through setup() then only moves the
+        # sample cursor back to 0 without paying new allocations
+        reuse = (
+            hasattr(self, "_recording")
+            and self.sfreq == sfreq
+            and self.n_channels == add_channels
+        )
+
         self.sfreq = sfreq
         self.dist = int(self.sfreq * 0.2)
+        self.n: int = 0
 
-        # Initialize recording with empty lists
-        self.instant_rr: List[float] = []
-        self.recording: List[float] = []
-        self.times: List[float] = []
-        self.n_channels: Optional[int] = add_channels
-        self.threshold: List[float] = []
-        self.diff: List[float] = []
-        self.peaks: List[int] = []
-        if add_channels is not None:
-            self.channels: Optional[Dict[str, List]] = {}
-            for i in range(add_channels):
-                self.channels[f"Channel_{i}"] = []
+        if reuse:
+            # Only the channels need zeroing: every other buffer is rewritten
+            # sample by sample as the cursor moves forward
+            if self.channels is not None:
+                self.channels._data[:] = 0
         else:
-            self.channels = None
+            # Preallocate the recording buffers. The `n` cursor indexes the
+            # next sample to write, buffers are doubled in size when the
+            # capacity is exhausted so that adding a sample remains a
+            # constant-time operation.
+            self._capacity: int = int(self.sfreq * 60)
+            self._recording = np.zeros(self._capacity, dtype=np.float32)
+            self._times = np.zeros(self._capacity, dtype=np.float32)
+            self._threshold = np.zeros(self._capacity, dtype=np.float32)
+            self._diff = np.zeros(self._capacity, dtype=np.float32)
+            self._peaks = np.zeros(self._capacity, dtype=np.uint8)
+            self._instant_rr = np.zeros(self._capacity, dtype=np.float32)
+
+            self.n_channels = add_channels
+            if add_channels is not None:
+                self.channels = _ChannelBuffer(self, add_channels)
+            else:
+                self.channels = None
+
+        # Incremental peaks bookkeeping, avoiding any rescan of the peaks
+        # buffer when computing the instantaneous heart rate
+        self._peak_count: int = 0
+        self._last_peak_idx: int = -1
+        self._prev_peak_idx: int = -1
+
+        # Running sums over the threshold window, updated in O(1) by adding
+        # the incoming sample and subtracting the one leaving the window
+        self._window: int = int(self.sfreq)
+        self._sum: float = 0.0
+        self._sumsq: float = 0.0
 
         # Set the get value function depending on the data format
         self.data_format = data_format
@@ -186,6 +416,113 @@ class Oximeter:
 
         return self
 
+    def _grow(self):
+        """Double the capacity of the recording buffers."""
+        self._capacity *= 2
+        for name in [
+            "_recording",
+            "_times",
+            "_threshold",
+            "_diff",
+            "_peaks",
+            "_instant_rr",
+        ]:
+            old = getattr(self, name)
+            new = np.zeros(self._capacity, dtype=old.dtype)
+            new[: self.n] = old
+            setattr(self, name, new)
+        if self.channels is not None:
+            self.channels._grow(self._capacity)
+
+    def _sync_peaks_state(self):
+        """Recompute the incremental peaks bookkeeping from the peaks buffer.
+
+        Only needed when the peaks buffer is overwritten from outside of
+        :py:func:`add_paquet`, e.g. when assigning to the `peaks` attribute.
+        """
+        peaks_idx = np.where(self._peaks[: self.n])[0]
+        self._peak_count = len(peaks_idx)
+        self._last_peak_idx = peaks_idx[-1] if self._peak_count >= 1 else -1
+        self._prev_peak_idx = peaks_idx[-2] if self._peak_count >= 2 else -1
+
+    def _sync_window_sums(self):
+        """Recompute the running threshold sums from the recording buffer.
+
+        Only needed when the window length changes or when the recording
+        buffer is overwritten from outside of :py:func:`add_paquet`.
+        """
+        win = self._recording[max(0, self.n - self._window) : self.n].astype(np.float64)
+        self._sum = win.sum()
+        self._sumsq = (win * win).sum()
+
+    def _set_buffer(self, buffer: np.ndarray, value):
+        """Overwrite the recorded part of a buffer.
+
+        If `value` does not match the current recording length, the buffer is
+        reset to `0` instead (e.g. when assigning an empty list to clear it).
+        """
+        value = np.asarray(value, dtype=buffer.dtype)
+        if value.size == self.n:
+            buffer[: self.n] = value
+        else:
+            buffer[: self.n] = 0
+
+    @property
+    def recording(self) -> np.ndarray:
+        """The PPG signal (zero-copy view on the preallocated buffer)."""
+        return self._recording[: self.n]
+
+    @recording.setter
+    def recording(self, value):
+        self._set_buffer(self._recording, value)
+        self._sync_window_sums()
+
+    @property
+    def times(self) -> np.ndarray:
+        """The time vector, in seconds."""
+        return self._times[: self.n]
+
+    @times.setter
+    def times(self, value):
+        self._set_buffer(self._times, value)
+
+    @property
+    def threshold(self) -> np.ndarray:
+        """The peaks detection threshold (rolling mean + standard deviation)."""
+        return self._threshold[: self.n]
+
+    @threshold.setter
+    def threshold(self, value):
+        self._set_buffer(self._threshold, value)
+
+    @property
+    def diff(self) -> np.ndarray:
+        """The differential of the PPG signal."""
+        return self._diff[: self.n]
+
+    @diff.setter
+    def diff(self, value):
+        self._set_buffer(self._diff, value)
+
+    @property
+    def peaks(self) -> np.ndarray:
+        """Array of 0 and 1 where 1 index detected peaks."""
+        return self._peaks[: self.n]
+
+    @peaks.setter
+    def peaks(self, value):
+        self._set_buffer(self._peaks, value)
+        self._sync_peaks_state()
+
+    @property
+    def instant_rr(self) -> np.ndarray:
+        """The instantaneous RR intervals, in milliseconds."""
+        return self._instant_rr[: self.n]
+
+    @instant_rr.setter
+    def instant_rr(self, value):
+        self._set_buffer(self._instant_rr, value)
+
     def add_paquet(self, value: int, window: float = 1.0):
         """Read a portion of data.
 
@@ -207,79 +544,79 @@ class Oximeter:
         additional channles with 0 if provided.
         """
 
-        # Store new data
-        self.recording.append(value)
-        self.peaks.append(0)
-
-        # Add 0 to the additional channels
-        if self.channels is not None:
-            for ch in self.channels:
-                self.channels[ch].append(0)
+        n = self.n
+        if n == self._capacity:
+            self._grow()
 
-        # Update times vector
-        if not self.times:
-            self.times = [0]
-        else:
-            self.times.append(len(self.times) / self.sfreq)
+        # The additional channels are preallocated with 0 and do not require
+        # any per-sample update
 
-        # Update threshold
+        # The running sums only hold for a fixed window length: recompute them
+        # from the recording buffer if the caller changes it
         window = int(window * self.sfreq)
-        self.threshold.append(
-            (np.mean(self.recording[-window:]) + np.std(self.recording[-window:]))
+        if window != self._window:
+            self._window = window
+            self._sync_window_sums()
+
+        # Store the new sample and update the peaks detection state machine
+        is_peak, self._sum, self._sumsq = _update_oximeter(
+            self._recording,
+            self._times,
+            self._threshold,
+            self._diff,
+            self._peaks,
+            n,
+            float(value),
+            self.sfreq,
+            window,
+            self.dist,
+            self._last_peak_idx,
+            self._sum,
+            self._sumsq,
         )
-
-        # Store new differential if not exist
-        if not self.diff:
-            self.diff = [0]
-        else:
-            self.diff.append(self.recording[-1] - self.recording[-2])
-
-            # Is it a threshold crossing value?
-            if value > self.threshold[-1]:
-
-                # Is the new differential zero or crossing zero?
-                if (self.diff[-1] <= 0) & (self.diff[-2] > 0):
-
-                    # Is it far enough from the previous peak (0.2 s)?
-                    if not any(self.peaks[-15:]):
-                        self.peaks[-1] = 1
+        if is_peak:
+            self._prev_peak_idx = self._last_peak_idx
+            self._last_peak_idx = n
+            self._peak_count += 1
 
         # Update instantaneous heart rate
-        if sum(self.peaks) >= 2:
-            self.instant_rr.append(
-                (np.diff(np.where(self.peaks)[0])[-1] / self.sfreq) * 1000
+        if self._peak_count >= 2:
+            self._instant_rr[n] = (
+                (self._last_peak_idx - self._prev_peak_idx) / self.sfreq * 1000
             )
         else:
-            self.instant_rr.append(float("nan"))
+            self._instant_rr[n] = np.nan
+
+        self.n = n + 1
 
         return self
 
-    def check(self, paquet: list):
+    def check(self, paquet) -> bool:
         """Check if the provided paquet is correct
 
         Parameters
         ----------
-        paquet : list
-            The paquet to inspect.
+        paquet : bytes | tuple | list
+            The paquet to inspect. Any sequence of 5 integers, e.g. the raw
+            `bytes` object returned by the serial port.
         """
-        check = False
-        if len(paquet) >= 5:
-            if (paquet[0] == 1) | (paquet[0] >= 128):
-                if (paquet[1] >= 0) & (paquet[1] <= 255):
-                    if (paquet[2] >= 0) & (paquet[2] <= 255):
-                        if paquet[3] <= 127:
-                            if paquet[4] == sum(paquet[:4]) % 256:
-                                check = True
-
-        return check
+        # Branchless validation: the checksum is the sum of the first 4 bytes
+        # modulo 256 (`& 0xFF` being cheaper than `% 256`)
+        return len(paquet) >= 5 and bool(
+            ((paquet[0] == 1) | (paquet[0] >= 128))
+            & (0 <= paquet[1] <= 255)
+            & (0 <= paquet[2] <= 255)
+            & (paquet[3] <= 127)
+            & (((paquet[0] + paquet[1] + paquet[2] + paquet[3]) & 0xFF) == paquet[4])
+        )
 
     def data_format2(self, paquet):
         """Extract pulse waveform value for data format 2.
 
         Parameters
         ----------
-        paquet : list
-            A list containg 5 items.
+        paquet : bytes | tuple | list
+            A sequence containg 5 items.
         """
         return paquet[2]
 
@@ -288,8 +625,8 @@ class Oximeter:
 
         Parameters
         ----------
-        paquet : list
-            A list containg 5 items.
+        paquet : bytes | tuple | list
+            A sequence containg 5 items.
         """
         return ((paquet[1] * 256 + paquet[2]) / 65535) * 255
 
@@ -310,11 +647,11 @@ class Oximeter:
             self.recording, sfreq=75, new_sfreq=75, **kwargs
         )
 
-        # R-R intervals (in miliseconds)
-        self.rr = (np.diff(np.where(peaks)[0]) / self.sfreq) * 1000
-
-        # Beats per minutes
-        self.bpm = 60000 / self.rr
+        # R-R intervals (in miliseconds) and beats per minutes, computed in a
+        # single pass over the peaks vector
+        self.rr, self.bpm = _rr_from_peaks(
+            np.asarray(peaks, dtype=np.bool_), float(self.sfreq)
+        )
 
         return self
 
@@ -368,11 +705,15 @@ class Oximeter:
         while time.time() - tstart < duration:
             if self.serial.inWaiting() >= 5:
                 # Store Oxi level
-                paquet = list(self.serial.read(5))
+                paquet = self.serial.read(5)
                 if self.check(paquet):
                     self.add_paquet(value=self.get_value(paquet))
                 else:
                     self.setup()
+            else:
+                # Sleep ~1/4 of a sampling interval instead of busy-polling
+                # the UART, which pins a CPU core without reading any faster
+                time.sleep(1 / (self.sfreq * 4))
         return self
 
     def readInWaiting(self, stop: bool = False):
@@ -384,21 +725,31 @@ class Oximeter:
             Stop the recording when an error is detected. Default is *False*.
         """
         # Read oxi
-        while self.serial.inWaiting() >= 5:
-            # Store Oxi level
-            paquet = list(self.serial.read(5))
-            if self.check(paquet):
-                self.add_paquet(value=self.get_value(paquet))
-            else:
-                if stop is True:
+        while True:
+            n_bytes = self.serial.inWaiting()
+            if n_bytes < 5:
+                break
+
+            # Drain all the complete paquets from the input buffer in a
+            # single read and slice it afterwards, amortizing the syscall
+            # cost over the number of waiting paquets
+            buf = self.serial.read((n_bytes // 5) * 5)
+            for i in range(0, len(buf), 5):
+                paquet = buf[i : i + 5]
+                if self.check(paquet):
+                    self.add_paquet(value=self.get_value(paquet))
+                elif stop is True:
                     raise ValueError("Synch error")
                 else:
                     print("Synch error")
                     while True:
                         self.serial.reset_input_buffer()
-                        paquet = list(self.serial.read(5))
+                        paquet = self.serial.read(5)
                         if self.check(paquet=paquet):
                             break
+                    # The rest of the drained buffer predates the
+                    # resynchronization and should be discarded
+                    break
 
     def save(self, fname: str):
         """Save the recording instance.
@@ -494,7 +845,7 @@ class Oximeter:
         while True:
             i += 1
             self.serial.reset_input_buffer()
-            paquet = list(self.serial.read(5))
+            paquet = self.serial.read(5)
             if self.check(paquet=paquet):
                 completed = True
                 break
@@ -506,7 +857,8 @@ class Oximeter:
 
         # Remove peaks
         if clear_peaks is True:
-            self.peaks = [0] * len(self.peaks)
+            self._peaks[: self.n] = 0
+            self._sync_peaks_state()
 
         return self
 
@@ -515,13 +867,16 @@ class Oximeter:
         while True:
             if self.serial.inWaiting() >= 5:
                 # Store Oxi level
-                paquet = list(self.serial.read(5))
+                paquet = self.serial.read(5)
                 if self.check(paquet):
                     self.add_paquet(value=self.get_value(paquet))
-                    if any(self.peaks[-2:]):  # Peak found
+                    if self._peaks[max(0, self.n - 2) : self.n].any():  # Peak found
                         break
                 else:
                     print("Synch error")
+            else:
+                # Sleep ~1/4 of a sampling interval instead of busy-polling
+                time.sleep(1 / (self.sfreq * 4))
         return self
 
 
@@ -147,6 +147,18 @@ class TestPlots(TestCase):
                 tmax=10.0,
             )
 
+        # A dense 2d triggers array should produce the same events as the
+        # equivalent list of 1d triggers vectors
+        triggers = np.zeros((2, 1000), dtype=int)
+        triggers[0, [100, 400, 700]] = 1
+        triggers[1, [250, 550]] = 1
+        ax_2d = plot_events(triggers=triggers, sfreq=1000)
+        ax_list = plot_events(triggers=[triggers[0], triggers[1]], sfreq=1000)
+        assert len(ax_2d.patches) == len(ax_list.patches) == 5
+        assert [line.get_xdata()[0] for line in ax_2d.lines] == [
+            line.get_xdata()[0] for line in ax_list.lines
+        ]
+
         plt.close("all")
 
     def test_plot_frequency(self):
@@ -54,6 +54,15 @@ class TestRecording(TestCase):
         oxi.times = []
         oxi.threshold = []
 
+        # Resetting with unchanged parameters should reuse the preallocated
+        # buffers and only move the sample cursor back to the start
+        recording_buffer = oxi._recording
+        oxi.reset(serial=oxi.serial, add_channels=oxi.n_channels)
+        assert oxi._recording is recording_buffer
+        assert oxi.n == 0
+        assert len(oxi.recording) == 0
+        assert oxi.channels["Channel_0"].size == 0
+
     def test_BrainVisionExG(self):
 
         data1 = b"\x8eEXC\x96\xc9\x86L\xafJ\x98\xbb\xf6\xc9\x14P\x8d\x00\x00\x00\x01\x00\x00\x00"